@@ -1,4 +1,6 @@
 """Class to hold all light accessories."""
+from datetime import datetime
+from functools import partial
 import logging
 
 from pyhap.const import CATEGORY_FAN
@@ -28,6 +30,7 @@ from homeassistant.const import (
     STATE_ON,
 )
 from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
 
 from .accessories import TYPES, HomeAccessory
 from .const import (
@@ -46,6 +49,13 @@ from .util import cleanup_name_for_homekit
 
 _LOGGER = logging.getLogger(__name__)
 
+CHANGE_COALESCE_TIME_WINDOW = 0.01
+
+TURN_ON_CHARS = {CHAR_ROTATION_SPEED, CHAR_TARGET_FAN_STATE}
+
+DIRECTION_HOMEKIT_TO_HASS = {0: DIRECTION_FORWARD, 1: DIRECTION_REVERSE}
+DIRECTION_HASS_TO_HOMEKIT = {v: k for k, v in DIRECTION_HOMEKIT_TO_HASS.items()}
+
 
 @TYPES.register("Fan")
 class Fan(HomeAccessory):
@@ -58,6 +68,8 @@ class Fan(HomeAccessory):
         """Initialize a new Fan accessory object."""
         super().__init__(*args, category=CATEGORY_FAN)
         self.chars = []
+        self._event_timer = None
+        self._pending_events = {}
         state = self.hass.states.get(self.entity_id)
 
         features = state.attributes.get(ATTR_SUPPORTED_FEATURES, 0)
@@ -82,6 +94,7 @@ class Fan(HomeAccessory):
         self.char_swing = None
         self.char_target_fan_state = None
         self.preset_mode_chars = {}
+        self._last_state_tuple = None
 
         if CHAR_ROTATION_DIRECTION in self.chars:
             self.char_direction = serv_fan.configure_char(
@@ -119,46 +132,77 @@ class Fan(HomeAccessory):
                 self.preset_mode_chars[preset_mode] = preset_serv.configure_char(
                     CHAR_ON,
                     value=False,
-                    setter_callback=lambda value, preset_mode=preset_mode: self.set_preset_mode(
-                        value, preset_mode
+                    setter_callback=partial(
+                        self.set_preset_mode, preset_mode=preset_mode
                     ),
                 )
 
         if CHAR_SWING_MODE in self.chars:
             self.char_swing = serv_fan.configure_char(CHAR_SWING_MODE, value=0)
+
+        # Speed is always set LAST to ensure they
+        # get the speed they asked for
+        self._char_handlers = tuple(
+            (char, handler)
+            for char, handler in (
+                (CHAR_SWING_MODE, self.set_oscillating),
+                (CHAR_ROTATION_DIRECTION, self.set_direction),
+                (CHAR_ROTATION_SPEED, self.set_percentage),
+                (CHAR_TARGET_FAN_STATE, self.set_single_preset_mode),
+            )
+            if char in self.chars
+        )
         self.async_update_state(state)
         serv_fan.setter_callback = self._set_chars
 
     def _set_chars(self, char_values):
         _LOGGER.debug("Fan _set_chars: %s", char_values)
-        if CHAR_ACTIVE in char_values:
-            if char_values[CHAR_ACTIVE]:
-                # If the device supports set speed we
-                # do not want to turn on as it will take
-                # the fan to 100% than to the desired speed.
-                #
-                # Setting the speed will take care of turning
-                # on the fan if FanEntityFeature.SET_SPEED is set.
-                if not self.char_speed or CHAR_ROTATION_SPEED not in char_values:
-                    self.set_state(1)
-            else:
-                # Its off, nothing more to do as setting the
-                # other chars will likely turn it back on which
-                # is what we want to avoid
-                self.set_state(0)
-                return
-
-        if CHAR_SWING_MODE in char_values:
-            self.set_oscillating(char_values[CHAR_SWING_MODE])
-        if CHAR_ROTATION_DIRECTION in char_values:
-            self.set_direction(char_values[CHAR_ROTATION_DIRECTION])
-
-        # We always do this LAST to ensure they
-        # get the speed they asked for
+        self._pending_events.update(char_values)
+        if self._event_timer:
+            self._event_timer()
+        self._event_timer = async_call_later(
+            self.hass, CHANGE_COALESCE_TIME_WINDOW, self._async_send_events
+        )
+
+    @callback
+    def _async_send_events(self, _now: datetime) -> None:
+        """Process all changes at once."""
+        _LOGGER.debug("Coalesced _set_chars: %s", self._pending_events)
+        char_values = self._pending_events
+        self._pending_events = {}
+        if CHAR_ACTIVE in char_values and not char_values[CHAR_ACTIVE]:
+            # Its off, nothing more to do as setting the
+            # other chars will likely turn it back on which
+            # is what we want to avoid
+            self.set_state(0)
+            return
+
+        turn_on = CHAR_ACTIVE in char_values
+        for char, handler in self._char_handlers:
+            # Speed and preset mode are sent with turn on
+            if char in char_values and not (turn_on and char in TURN_ON_CHARS):
+                handler(char_values[char])
+        if turn_on:
+            self._turn_on(char_values)
+
+    def _turn_on(self, char_values):
+        """Turn on the fan with the speed and preset mode in one call."""
+        params = {ATTR_ENTITY_ID: self.entity_id}
         if CHAR_ROTATION_SPEED in char_values:
-            self.set_percentage(char_values[CHAR_ROTATION_SPEED])
+            params[ATTR_PERCENTAGE] = char_values[CHAR_ROTATION_SPEED]
         if CHAR_TARGET_FAN_STATE in char_values:
-            self.set_single_preset_mode(char_values[CHAR_TARGET_FAN_STATE])
+            if char_values[CHAR_TARGET_FAN_STATE]:
+                # The preset mode wins over the speed
+                # as it used to be set after it
+                params.pop(ATTR_PERCENTAGE, None)
+                params[ATTR_PRESET_MODE] = self.preset_modes[0]
+            elif ATTR_PERCENTAGE not in params:
+                current_state = self.hass.states.get(self.entity_id)
+                percentage = current_state.attributes.get(ATTR_PERCENTAGE) or 50
+                params[ATTR_PERCENTAGE] = percentage
+        _LOGGER.debug("%s: Turn on with %s", self.entity_id, params)
+        value = params.get(ATTR_PRESET_MODE, params.get(ATTR_PERCENTAGE))
+        self.async_call_service(DOMAIN, SERVICE_TURN_ON, params, value)
 
     def set_single_preset_mode(self, value):
         """Set auto call came from HomeKit."""
@@ -198,7 +242,7 @@ class Fan(HomeAccessory):
     def set_direction(self, value):
         """Set state if call came from HomeKit."""
         _LOGGER.debug("%s: Set direction to %d", self.entity_id, value)
-        direction = DIRECTION_REVERSE if value == 1 else DIRECTION_FORWARD
+        direction = DIRECTION_HOMEKIT_TO_HASS[value]
         params = {ATTR_ENTITY_ID: self.entity_id, ATTR_DIRECTION: direction}
         self.async_call_service(DOMAIN, SERVICE_SET_DIRECTION, params, direction)
 
@@ -216,56 +260,80 @@ class Fan(HomeAccessory):
         self.async_call_service(DOMAIN, SERVICE_SET_PERCENTAGE, params, value)
 
     @callback
-    async def async_handle_state(self, state):
-    self._state = 1 if state == STATE_ON else 0
-    self.char_active.set_value(self._state)
-
-async def async_handle_direction(self, direction):
-    if direction in (DIRECTION_FORWARD, DIRECTION_REVERSE):
-        hk_direction = 1 if direction == DIRECTION_REVERSE else 0
-        self.char_direction.set_value(hk_direction)
-
-async def async_handle_speed(self, percentage, state):
-    if percentage == 0 and state == STATE_ON:
-        percentage = max(1, self.char_speed.properties[PROP_MIN_STEP])
-    if percentage is not None:
-        self.char_speed.set_value(percentage)
-
-async def async_handle_oscillating(self, oscillating):
-    hk_oscillating = 1 if oscillating else 0
-    self.char_swing.set_value(hk_oscillating)
-
-async def async_handle_preset_mode(self, current_preset_mode):
-    self.char_target_fan_state.set_value(int(current_preset_mode is not None))
-
-async def async_handle_multiple_preset_modes(self, current_preset_mode):
-    for preset_mode, char in self.preset_mode_chars.items():
-        hk_value = 1 if preset_mode == current_preset_mode else 0
-        char.set_value(hk_value)
-
-async def async_update_state(self, new_state):
-    """Update fan after state change."""
-    state = new_state.state
-    attributes = new_state.attributes
-    
-    if state in (STATE_ON, STATE_OFF):
-        await async_handle_state(self, state)
-
-    if self.char_direction is not None:
+    def async_update_state(self, new_state):
+        """Update fan after state change."""
+        state = new_state.state
+        attributes = new_state.attributes
         direction = attributes.get(ATTR_DIRECTION)
-        await async_handle_direction(self, direction)
-
-    if self.char_speed is not None and state != STATE_OFF:
         percentage = attributes.get(ATTR_PERCENTAGE)
-        await async_handle_speed(self, percentage, state)
-
-    if self.char_swing is not None:
         oscillating = attributes.get(ATTR_OSCILLATING)
-        if isinstance(oscillating, bool):
-            await async_handle_oscillating(self, oscillating)
-            
-    current_preset_mode = attributes.get(ATTR_PRESET_MODE)
-    if self.char_target_fan_state is not None:
-        await async_handle_preset_mode(self, current_preset_mode)
-    else:
-        await async_handle_multiple_preset_modes(self, current_preset_mode)
\ No newline at end of file
+        current_preset_mode = attributes.get(ATTR_PRESET_MODE)
+
+        # Nothing HomeKit cares about has changed
+        state_tuple = (state, direction, percentage, oscillating, current_preset_mode)
+        if state_tuple == self._last_state_tuple:
+            return
+        self._last_state_tuple = state_tuple
+
+        if state in (STATE_ON, STATE_OFF):
+            self._update_state(state)
+
+        if self.char_direction is not None:
+            self._update_direction(direction)
+
+        if self.char_speed is not None and state != STATE_OFF:
+            # We do not change the homekit speed when turning off
+            # as it will clear the restore state
+            self._update_speed(percentage, state)
+
+        if self.char_swing is not None and isinstance(oscillating, bool):
+            self._update_oscillating(oscillating)
+
+        if self.char_target_fan_state is not None:
+            self._update_preset_mode(current_preset_mode)
+        else:
+            self._update_multiple_preset_modes(current_preset_mode)
+
+    def _update_state(self, state):
+        self._state = 1 if state == STATE_ON else 0
+        if self.char_active.value != self._state:
+            self.char_active.set_value(self._state)
+
+    def _update_direction(self, direction):
+        if (
+            hk_direction := DIRECTION_HASS_TO_HOMEKIT.get(direction)
+        ) is not None and self.char_direction.value != hk_direction:
+            self.char_direction.set_value(hk_direction)
+
+    def _update_speed(self, percentage, state):
+        # If the homeassistant component reports its speed as the first entry
+        # in its speed list but is not off, the hk_speed_value is 0. But 0
+        # is a special value in homekit. When you turn on a homekit accessory
+        # it will try to restore the last rotation speed state which will be
+        # the last value saved by char_speed.set_value. But if it is set to
+        # 0, HomeKit will update the rotation speed to 100 as it thinks 0 is
+        # off.
+        #
+        # Therefore, if the hk_speed_value is 0 and the device is still on,
+        # the rotation speed is mapped to 1 otherwise the update is ignored
+        # in order to avoid this incorrect behavior.
+        if percentage == 0 and state == STATE_ON:
+            percentage = max(1, self.char_speed.properties[PROP_MIN_STEP])
+        if percentage is not None and self.char_speed.value != percentage:
+            self.char_speed.set_value(percentage)
+
+    def _update_oscillating(self, oscillating):
+        hk_oscillating = 1 if oscillating else 0
+        if self.char_swing.value != hk_oscillating:
+            self.char_swing.set_value(hk_oscillating)
+
+    def _update_preset_mode(self, current_preset_mode):
+        hk_value = int(current_preset_mode is not None)
+        if self.char_target_fan_state.value != hk_value:
+            self.char_target_fan_state.set_value(hk_value)
+
+    def _update_multiple_preset_modes(self, current_preset_mode):
+        for preset_mode, char in self.preset_mode_chars.items():
+            hk_value = 1 if preset_mode == current_preset_mode else 0
+            if char.value != hk_value:
+                char.set_value(hk_value)
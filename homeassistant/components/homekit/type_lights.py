@@ -1,6 +1,8 @@
 """Class to hold all light accessories."""
 from __future__ import annotations
 
+from datetime import datetime
+from functools import lru_cache
 import logging
 
 from pyhap.const import CATEGORY_LIGHTBULB
@@ -58,7 +60,18 @@ CHANGE_COALESCE_TIME_WINDOW = 0.01
 DEFAULT_MIN_COLOR_TEMP = 2000  # 500 mireds
 DEFAULT_MAX_COLOR_TEMP = 6500  # 153 mireds
 
-COLOR_MODES_WITH_WHITES = {ColorMode.RGBW, ColorMode.RGBWW, ColorMode.WHITE}
+COLOR_TEMP_CACHE_SIZE = 256
+
+# HomeKit brightness percentage (0-100) to a 0-255 channel value
+_PCT_TO_BYTE = tuple(round(pct * 255 / 100) for pct in range(101))
+
+# Lights tend to share a small set of color temperatures
+_color_temperature_to_hs = lru_cache(maxsize=COLOR_TEMP_CACHE_SIZE)(
+    color_temperature_to_hs
+)
+_color_temperature_kelvin_to_mired = lru_cache(maxsize=COLOR_TEMP_CACHE_SIZE)(
+    color_temperature_kelvin_to_mired
+)
 
 
 @TYPES.register("Light")
@@ -75,6 +88,7 @@ class Light(HomeAccessory):
         self.chars = []
         self._event_timer = None
         self._pending_events = {}
+        self._last_new_state = None
 
         state = self.hass.states.get(self.entity_id)
         attributes = state.attributes
@@ -95,8 +109,11 @@ class Light(HomeAccessory):
         if self.color_supported:
             self.chars.extend([CHAR_HUE, CHAR_SATURATION])
 
-        if self.color_temp_supported or COLOR_MODES_WITH_WHITES.intersection(
-            self.color_modes
+        if (
+            self.color_temp_supported
+            or self.rgbw_supported
+            or self.rgbww_supported
+            or self.white_supported
         ):
             self.chars.append(CHAR_COLOR_TEMPERATURE)
 
@@ -175,10 +192,20 @@ class Light(HomeAccessory):
         if CHAR_COLOR_TEMPERATURE in char_values:
             temp = char_values[CHAR_COLOR_TEMPERATURE]
             events.append(f"color temperature at {temp}")
-            bright_val = round(
-                ((brightness_pct or self.char_brightness.value) * 255) / 100
-            )
-            # ... rest of the logic
+            bright_val = _PCT_TO_BYTE[int(brightness_pct or self.char_brightness.value)]
+            if self.color_temp_supported:
+                params[ATTR_COLOR_TEMP_KELVIN] = color_temperature_mired_to_kelvin(temp)
+            elif self.rgbww_supported:
+                params[ATTR_RGBWW_COLOR] = color_temperature_to_rgbww(
+                    color_temperature_mired_to_kelvin(temp),
+                    bright_val,
+                    color_temperature_mired_to_kelvin(self.max_mireds),
+                    color_temperature_mired_to_kelvin(self.min_mireds),
+                )
+            elif self.rgbw_supported:
+                params[ATTR_RGBW_COLOR] = (*(0,) * 3, bright_val)
+            elif self.white_supported:
+                params[ATTR_WHITE] = bright_val
 
     def _handle_color(self, char_values, events, params):
         if CHAR_HUE in char_values or CHAR_SATURATION in char_values:
@@ -189,7 +216,8 @@ class Light(HomeAccessory):
             events.append(f"set color at {hue_sat}")
             params[ATTR_HS_COLOR] = hue_sat
 
-    async def async_send_events(self, *):
+    @callback
+    def _async_send_events(self, _now: datetime) -> None:
         """Process all changes at once."""
         _LOGGER.debug("Coalesced _set_chars: %s", self._pending_events)
         char_values = self._pending_events
@@ -206,8 +234,10 @@ class Light(HomeAccessory):
             )
             return
 
-        self._handle_white_channels(char_values, brightness_pct, events, params)
-        self._handle_color(char_values, events, params)
+        if CHAR_COLOR_TEMPERATURE in char_values:
+            self._handle_white_channels(char_values, brightness_pct, events, params)
+        else:
+            self._handle_color(char_values, events, params)
 
         if (
             brightness_pct
@@ -222,60 +252,101 @@ class Light(HomeAccessory):
         self.async_call_service(DOMAIN, service, params, ", ".join(events))
 
     @callback
-   async def async_update_brightness(self, attributes, state):
-    brightness = attributes.get(ATTR_BRIGHTNESS)
-    if brightness is not None and isinstance(brightness, (int, float)):
-        brightness = round(brightness / 255 * 100, 0)
-        if brightness == 0 and state == STATE_ON:
-            brightness = 1
-        self.char_brightness.set_value(brightness)
-        if self._previous_color_mode != attributes.get(ATTR_COLOR_MODE):
-            self.char_brightness.notify()
-
-async def async_update_color(self, attributes):
-    if color_temp := attributes.get(ATTR_COLOR_TEMP_KELVIN):
-        hue, saturation = color_temperature_to_hs(color_temp)
-    elif attributes.get(ATTR_COLOR_MODE) == ColorMode.WHITE:
-        hue, saturation = 0, 0
-    else:
-        hue, saturation = attributes.get(ATTR_HS_COLOR, (None, None))
-    if isinstance(hue, (int, float)) and isinstance(saturation, (int, float)):
-        self.char_hue.set_value(round(hue, 0))
-        self.char_saturation.set_value(round(saturation, 0))
-        if self._previous_color_mode != attributes.get(ATTR_COLOR_MODE):
-            self.char_hue.notify()
-            self.char_saturation.notify()
-
-async def async_update_color_temperature(self, attributes):
-    color_temp = None
-    if self.color_temp_supported:
-        color_temp_kelvin = attributes.get(ATTR_COLOR_TEMP_KELVIN)
-        if color_temp_kelvin is not None:
-            color_temp = color_temperature_kelvin_to_mired(color_temp_kelvin)
-    elif attributes.get(ATTR_COLOR_MODE) == ColorMode.WHITE:
-        color_temp = self.min_mireds
-    if isinstance(color_temp, (int, float)):
-        self.char_color_temp.set_value(round(color_temp, 0))
-        if self._previous_color_mode != attributes.get(ATTR_COLOR_MODE):
-            self.char_color_temp.notify()
-
-async def async_update_state(self, new_state):
-    """Update light after state change."""
-    # Handle State
-    state = new_state.state
-    attributes = new_state.attributes
-    color_mode = attributes.get(ATTR_COLOR_MODE)
-    self.char_on.set_value(int(state == STATE_ON))
-    self._previous_color_mode = color_mode
-    
-    # Handle Brightness
-    if self.brightness_supported:
-        await async_update_brightness(self, attributes, state)
-
-    # Handle Color
-    if self.color_supported:
-        await async_update_color(self, attributes)
-
-    # Handle white channels
-    if CHAR_COLOR_TEMPERATURE in self.chars:
-        await async_update_color_temperature(self, attributes)
\ No newline at end of file
+    def async_update_state(self, new_state):
+        """Update light after state change."""
+        # The same State is delivered again when the accessory starts
+        # running, a new or forced state change is always a new object
+        if new_state is self._last_new_state:
+            return
+        self._last_new_state = new_state
+        # Handle State
+        state = new_state.state
+        attributes = new_state.attributes
+        new_mode = attributes.get(ATTR_COLOR_MODE)
+        mode_changed = self._previous_color_mode != new_mode
+        hk_on = int(state == STATE_ON)
+        if self.char_on.value != hk_on:
+            self.char_on.set_value(hk_on)
+
+        # Handle Brightness
+        if (
+            self.brightness_supported
+            # brightness is always numeric or None per the light platform contract
+            and (brightness := attributes.get(ATTR_BRIGHTNESS)) is not None
+        ):
+            try:
+                brightness = round(brightness / 255 * 100, 0)
+            except TypeError:
+                # brightness is not numeric, nothing to update
+                pass
+            else:
+                # The homeassistant component might report its brightness as 0 but is
+                # not off. But 0 is a special value in homekit. When you turn on a
+                # homekit accessory it will try to restore the last brightness state
+                # which will be the last value saved by char_brightness.set_value.
+                # But if it is set to 0, HomeKit will update the brightness to 100 as
+                # it thinks 0 is off.
+                #
+                # Therefore, if the the brightness is 0 and the device is still on,
+                # the brightness is mapped to 1 otherwise the update is ignored in
+                # order to avoid this incorrect behavior.
+                if brightness == 0 and state == STATE_ON:
+                    brightness = 1
+                if self.char_brightness.value != brightness:
+                    self.char_brightness.set_value(brightness)
+                if mode_changed:
+                    self.char_brightness.notify()
+
+        # Handle Color - color must always be set before color temperature
+        # or the iOS UI will not display it correctly.
+        if self.color_supported:
+            hue = saturation = None
+            try:
+                if color_temp := attributes.get(ATTR_COLOR_TEMP_KELVIN):
+                    hue, saturation = _color_temperature_to_hs(color_temp)
+                elif new_mode == ColorMode.WHITE:
+                    hue, saturation = 0, 0
+                else:
+                    hue, saturation = attributes.get(ATTR_HS_COLOR, (None, None))
+            except TypeError:
+                # color_temp_kelvin or hs_color is not usable, nothing to update
+                pass
+            if hue is not None and saturation is not None:
+                try:
+                    hue, saturation = round(hue, 0), round(saturation, 0)
+                except TypeError:
+                    # hs_color is not numeric, nothing to update
+                    pass
+                else:
+                    if self.char_hue.value != hue:
+                        self.char_hue.set_value(hue)
+                    if self.char_saturation.value != saturation:
+                        self.char_saturation.set_value(saturation)
+                    if mode_changed:
+                        # If the color temp changed, be sure to force the color to update
+                        self.char_hue.notify()
+                        self.char_saturation.notify()
+
+        # Handle white channels
+        if CHAR_COLOR_TEMPERATURE in self.chars:
+            color_temp = None
+            if self.color_temp_supported:
+                color_temp_kelvin = attributes.get(ATTR_COLOR_TEMP_KELVIN)
+                if color_temp_kelvin is not None:
+                    try:
+                        color_temp = _color_temperature_kelvin_to_mired(
+                            color_temp_kelvin
+                        )
+                    except TypeError:
+                        # color_temp_kelvin is not numeric, nothing to update
+                        pass
+            elif new_mode == ColorMode.WHITE:
+                color_temp = self.min_mireds
+            if color_temp is not None:
+                color_temp = round(color_temp, 0)
+                if self.char_color_temp.value != color_temp:
+                    self.char_color_temp.set_value(color_temp)
+                if mode_changed:
+                    self.char_color_temp.notify()
+
+        self._previous_color_mode = new_mode
@@ -2240,7 +2240,7 @@ def _change_statistics_unit_for_table(
     """Insert statistics in the database."""
     columns = (table.id, table.mean, table.min, table.max, table.state, table.sum)
     query = session.query(*columns).filter_by(metadata_id=bindparam("metadata_id"))
-    rows = execute(query.params(metadata_id=metadata_id))
+    rows = execute(query.params(metadata_id=metadata_id), raw=True)
     for row in rows:
         session.query(table).filter(table.id == row.id).update(
             {
@@ -4,7 +4,6 @@ from __future__ import annotations
 from collections.abc import Iterable
 from typing import TYPE_CHECKING, cast
 
-from lru import LRU  # pylint: disable=no-name-in-module
 from sqlalchemy.orm.session import Session
 
 from homeassistant.core import Event
@@ -29,7 +28,7 @@ class EventTypeManager(BaseLRUTableManager[EventTypes]):
     def __init__(self, recorder: Recorder) -> None:
         """Initialize the event type manager."""
         super().__init__(recorder, CACHE_SIZE)
-        self._non_existent_event_types: LRU = LRU(CACHE_SIZE)
+        self._non_existent_event_types: set[str] = set()
 
     def load(self, events: list[Event], session: Session) -> None:
         """Load the event_type to event_type_ids mapping into memory.
@@ -53,57 +52,88 @@ class EventTypeManager(BaseLRUTableManager[EventTypes]):
         """
         return self.get_many((event_type,), session)[event_type]
 
-   def get_many(self, event_types: Iterable[str], session: Session, from_recorder: bool = False) -> dict[str, int | None]:
-    """Resolve event_types to event_type_ids.
+    def get_many(
+        self, event_types: Iterable[str], session: Session, from_recorder: bool = False
+    ) -> dict[str, int | None]:
+        """Resolve event_types to event_type_ids.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        results, missing = self._get_initial_results_and_missing(event_types)
+
+        if not missing:
+            return results
+
+        with session.no_autoflush:
+            self._fetch_missing_event_ids_from_db(session, missing, results)
+
+        if non_existent := [
+            event_type for event_type in missing if results[event_type] is None
+        ]:
+            self._handle_non_existent_event_types(non_existent, from_recorder)
 
-    This call is not thread-safe and must be called from the
-    recorder thread.
-    """
-    results, missing = self._get_initial_results_and_missing(event_types)
-    
-    if not missing:
         return results
 
-    with session.no_autoflush:
-        self._fetch_missing_event_ids_from_db(session, missing, results)
-    
-    non_existent = [event_type for event_type in missing if results[event_type] is None]
-    
-    if non_existent:
-        self._handle_non_existent_event_types(non_existent, from_recorder)
-    
-    return results
-
-def _get_initial_results_and_missing(self, event_types: Iterable[str]) -> Tuple[dict[str, int | None], list[str]]:
-    """Get initial results and a list of event types that are missing from the cache."""
-    results = {}
-    missing = []
-    
-    for event_type in event_types:
-        event_type_id = self._id_map.get(event_type)
-        
-        if event_type_id is None and event_type in self._non_existent_event_types:
-            results[event_type] = None
-        elif event_type_id is None:
-            missing.append(event_type)
-        
-        results[event_type] = event_type_id
-    
-    return results, missing
-
-def _fetch_missing_event_ids_from_db(self, session: Session, missing: list[str], results: dict[str, int | None]) -> None:
-    """Fetch missing event type ids from the database and update the cache and results."""
-    for missing_chunk in chunked(missing, SQLITE_MAX_BIND_VARS):
-        for event_type_id, event_type in execute_stmt_lambda_element(session, find_event_type_ids(missing_chunk), orm_rows=False):
-            results[event_type] = self._id_map[event_type] = cast(int, event_type_id)
-
-def _handle_non_existent_event_types(self, non_existent: list[str], from_recorder: bool) -> None:
-    """Handle event types that do not exist in the database."""
-    if from_recorder:
-        for event_type in non_existent:
-            self._non_existent_event_types[event_type] = None
-    else:
-        self.recorder.queue_task(RefreshEventTypesTask(non_existent))
+    def _get_initial_results_and_missing(
+        self, event_types: Iterable[str]
+    ) -> tuple[dict[str, int | None], list[str]]:
+        """Resolve event_types from the cache and return the ones that are missing."""
+        id_map_get = self._id_map.get
+        non_existent_event_types = self._non_existent_event_types
+        pending = self._pending
+        results: dict[str, int | None] = {}
+        missing: list[str] = []
+        for event_type in event_types:
+            if (event_type_id := id_map_get(event_type)) is not None:
+                results[event_type] = event_type_id
+            else:
+                results[event_type] = None
+                # Pending event types cannot be in the database yet, they
+                # get their id in post_commit_pending
+                if (
+                    event_type not in non_existent_event_types
+                    and event_type not in pending
+                ):
+                    missing.append(event_type)
+        return results, missing
+
+    def _fetch_missing_event_ids_from_db(
+        self, session: Session, missing: list[str], results: dict[str, int | None]
+    ) -> None:
+        """Fetch missing event_type_ids from the database into the cache and results."""
+        # Usually only a handful of event types are missing
+        missing_chunks: Iterable[list[str]] = (
+            (missing,)
+            if len(missing) <= SQLITE_MAX_BIND_VARS
+            else chunked(missing, SQLITE_MAX_BIND_VARS)
+        )
+        for missing_chunk in missing_chunks:
+            found: dict[str, int] = {
+                event_type: cast(int, event_type_id)
+                for event_type_id, event_type in execute_stmt_lambda_element(
+                    session, find_event_type_ids(missing_chunk), orm_rows=False
+                )
+            }
+            self._id_map.update(found)
+            results.update(found)
+
+    def _handle_non_existent_event_types(
+        self, non_existent: list[str], from_recorder: bool
+    ) -> None:
+        """Remember or refresh event types that do not exist in the database."""
+        if from_recorder:
+            # We are already in the recorder thread so we can update the
+            # non-existent event types directly.
+            non_existent_event_types = self._non_existent_event_types
+            # Values are never needed so a set is enough; start over once it
+            # grows past the cache size instead of tracking recency.
+            if len(non_existent_event_types) + len(non_existent) > CACHE_SIZE:
+                non_existent_event_types.clear()
+            non_existent_event_types.update(non_existent)
+        else:
+            # Queue a task to refresh the event types from the database.
+            self.recorder.queue_task(RefreshEventTypesTask(non_existent))
 
     def add_pending(self, db_event_type: EventTypes) -> None:
         """Add a pending EventTypes that will be committed at the next interval.
@@ -132,7 +162,7 @@ def _handle_non_existent_event_types(self, non_existent: list[str], from_recorde
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        self._non_existent_event_types.pop(event_type, None)
+        self._non_existent_event_types.discard(event_type)
 
     def evict_purged(self, event_types: Iterable[str]) -> None:
         """Evict purged event_types from the cache when they are no longer used.
@@ -5,12 +5,12 @@ from collections.abc import Callable, Generator, Iterable, Sequence
 from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 import functools
-from functools import partial
 from itertools import islice
 import logging
 import os
 import time
 from typing import TYPE_CHECKING, Any, Concatenate, NoReturn, ParamSpec, TypeVar
+from urllib.parse import quote
 
 from awesomeversion import (
     AwesomeVersion,
@@ -60,6 +60,7 @@ RETRIES = 3
 QUERY_RETRY_WAIT = 0.1
 SQLITE3_POSTFIXES = ["", "-wal", "-shm"]
 DEFAULT_YIELD_STATES_ROWS = 32768
+DATETIME_CACHE_SIZE = 4096
 
 
 # Our minimum versions for each database
@@ -89,6 +90,47 @@ MIN_VERSION_PGSQL = _simple_version("12.0")
 MIN_VERSION_SQLITE = _simple_version("3.31.0")
 
 
+@functools.lru_cache(maxsize=16)
+def _version_tuple(version: AwesomeVersion) -> tuple[int, int, int]:
+    """Return the major, minor and patch of a version as integers.
+
+    Comparing integer tuples is much cheaper than comparing AwesomeVersions.
+    """
+    return (version.section(0), version.section(1), version.section(2))
+
+
+def _is_in_version_ranges(
+    version: tuple[int, int, int],
+    ranges: tuple[tuple[tuple[int, int, int], tuple[int, int, int]], ...],
+) -> bool:
+    """Return True if the version is within any of the [start, end) ranges."""
+    return any(start <= version < end for start, end in ranges)
+
+
+_MIN_VERSION_MARIA_DB = _version_tuple(MIN_VERSION_MARIA_DB)
+_MIN_VERSION_MYSQL = _version_tuple(MIN_VERSION_MYSQL)
+_MIN_VERSION_PGSQL = _version_tuple(MIN_VERSION_PGSQL)
+_MIN_VERSION_SQLITE = _version_tuple(MIN_VERSION_SQLITE)
+_MARIA_DB_106 = _version_tuple(MARIA_DB_106)
+_MARIA_DB_107 = _version_tuple(MARIA_DB_107)
+_MARIA_DB_108 = _version_tuple(MARIA_DB_108)
+_NO_VERSION = (0, 0, 0)
+# MariaDB versions older than the recommended minimum of their series
+_MARIADB_RANGE_INDEX_REGRESSION = (
+    (_NO_VERSION, _version_tuple(RECOMMENDED_MIN_VERSION_MARIA_DB)),
+    (_MARIA_DB_106, _version_tuple(RECOMMENDED_MIN_VERSION_MARIA_DB_106)),
+    (_MARIA_DB_107, _version_tuple(RECOMMENDED_MIN_VERSION_MARIA_DB_107)),
+    (_MARIA_DB_108, _version_tuple(RECOMMENDED_MIN_VERSION_MARIA_DB_108)),
+)
+# MariaDB versions without the fix for slow range queries in IN
+_MARIADB_SLOW_RANGE_IN_SELECT = (
+    (_NO_VERSION, _version_tuple(MARIADB_WITH_FIXED_IN_QUERIES_105)),
+    (_MARIA_DB_106, _version_tuple(MARIADB_WITH_FIXED_IN_QUERIES_106)),
+    (_MARIA_DB_107, _version_tuple(MARIADB_WITH_FIXED_IN_QUERIES_107)),
+    (_MARIA_DB_108, _version_tuple(MARIADB_WITH_FIXED_IN_QUERIES_108)),
+)
+
+
 # This is the maximum time after the recorder ends the session
 # before we no longer consider startup to be a "restart" and we
 # should do a check on the sqlite3 database.
@@ -99,10 +141,31 @@ RETRYABLE_MYSQL_ERRORS = (1205, 1206, 1213)
 # 1205: Lock wait timeout exceeded; try restarting transaction
 # 1206: The total number of locks exceeds the lock table size
 # 1213: Deadlock found when trying to get lock; try restarting transaction
+_RETRYABLE_MYSQL_ERRORS_SET = frozenset(RETRYABLE_MYSQL_ERRORS)
+
+# The recorder runs and schema changes tables are small
+# enough to be read in full
+_FULL_SCAN_TABLES = frozenset((TABLE_RECORDER_RUNS, TABLE_SCHEMA_CHANGES))
+# Built once at import
+_SANITY_CHECK_STATEMENTS: tuple[str, ...] = tuple(
+    f"SELECT * FROM {table};"  # noqa: S608 # not injection
+    if table in _FULL_SCAN_TABLES
+    else f"SELECT * FROM {table} LIMIT 1;"  # noqa: S608 # not injection
+    for table in TABLES_TO_CHECK
+)
+# Run as a single script so sqlite only has to parse it once
+_SANITY_CHECK_SCRIPT = "".join(_SANITY_CHECK_STATEMENTS)
 
 FIRST_POSSIBLE_SUNDAY = 8
 SUNDAY_WEEKDAY = 6
 DAYS_IN_WEEK = 7
+_SAKAMOTO_MONTH_OFFSETS = (0, 3, 2, 5, 0, 3, 5, 1, 4, 6, 2, 4)
+
+_ONE_HOUR = timedelta(hours=1)
+_ONE_DAY = timedelta(days=1)
+_ONE_WEEK = timedelta(weeks=1)
+# Time windows of two days or more are streamed
+_STREAM_RESULTS_WINDOW_SEC = 2 * 86400
 
 
 @contextmanager
@@ -141,7 +204,7 @@ def session_scope(
         session.close()
 
 
-def log_debug(debug, to_native, result, timer_start):
+def log_debug(to_native, result, timer_start):
     elapsed = time.perf_counter() - timer_start
     if to_native:
         _LOGGER.debug(
@@ -156,6 +219,7 @@ def log_debug(debug, to_native, result, timer_start):
             elapsed,
         )
 
+
 def handle_query_error(err, tryno):
     _LOGGER.error("Error executing query: %s", err)
 
@@ -163,46 +227,59 @@ def handle_query_error(err, tryno):
         raise
     time.sleep(QUERY_RETRY_WAIT)
 
-def execute_query(qry, to_native, validate_entity_ids):
+
+def execute_query(qry, to_native, validate_entity_ids, raw=False):
     if to_native:
         return [
             row
             for row in (
-                row.to_native(validate_entity_id=validate_entity_ids)
-                for row in qry
+                row.to_native(validate_entity_id=validate_entity_ids) for row in qry
             )
             if row is not None
         ]
-    else:
-        return qry.all()
+    if raw:
+        # Execute the underlying select on the connection so the rows
+        # are returned as plain column rows instead of loaded entities
+        statement = qry.statement
+        result = qry.session.connection().execute(statement)
+        if len(statement.selected_columns) == 1:
+            return result.scalars().all()
+        return result.all()
+    return qry.all()
+
 
 def execute(
-    qry: Query, to_native: bool = False, validate_entity_ids: bool = True
+    qry: Query,
+    to_native: bool = False,
+    validate_entity_ids: bool = True,
+    raw: bool = False,
 ) -> list[Row]:
     """Query the database and convert the objects to HA native form.
 
+    If raw is set and to_native is not, the rows of the query's select
+    statement are returned without going through the ORM, or the values
+    themselves when a single column is selected.
+
     This method also retries a few times in the case of stale connections.
     """
-    debug = _LOGGER.isEnabledFor(logging.DEBUG)
-
-    for tryno in range(RETRIES):
-        try:
-            timer_start = None
-            if debug:
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        for tryno in range(RETRIES):
+            try:
                 timer_start = time.perf_counter()
-
-            result = execute_query(qry, to_native, validate_entity_ids)
-
-            if debug:
-                log_debug(debug, to_native, result, timer_start)
-
-            return result
-
-        except SQLAlchemyError as err:
-            handle_query_error(err, tryno)
+                result = execute_query(qry, to_native, validate_entity_ids, raw)
+                log_debug(to_native, result, timer_start)
+                return result
+            except SQLAlchemyError as err:
+                handle_query_error(err, tryno)
+    else:
+        for tryno in range(RETRIES):
+            try:
+                return execute_query(qry, to_native, validate_entity_ids, raw)
+            except SQLAlchemyError as err:
+                handle_query_error(err, tryno)
 
     # Unreachable
-    raise RuntimeError  # pragma: no cover
+    raise RuntimeError  # pragma: no cover
 
 
 def execute_stmt_lambda_element(
@@ -216,24 +293,33 @@ def execute_stmt_lambda_element(
     """Execute a StatementLambdaElement.
 
     If the time window passed is greater than one day
-    the execution method will switch to yield_per to
-    reduce memory pressure.
+    the execution method will switch to streaming the
+    results with yield_per to reduce memory pressure.
 
     It is not recommended to pass a time window
     when selecting non-ranged rows (ie selecting
     specific entities) since they are usually faster
     with .all().
     """
-    use_all = not start_time or ((end_time or dt_util.utcnow()) - start_time).days <= 1
+    if not start_time:
+        use_all = True
+    else:
+        end_ts = end_time.timestamp() if end_time else time.time()
+        use_all = end_ts - start_time.timestamp() < _STREAM_RESULTS_WINDOW_SEC
     for tryno in range(RETRIES):
         try:
-            if orm_rows:
-                executed = session.execute(stmt)
-            else:
-                executed = session.connection().execute(stmt)
             if use_all:
-                return executed.all()
-            return executed.yield_per(yield_per)
+                if orm_rows:
+                    return session.execute(stmt).all()
+                return session.connection().execute(stmt).all()
+            # Use a server side cursor so the client only holds
+            # yield_per rows at a time instead of the whole result
+            execution_options = {"stream_results": True, "yield_per": yield_per}
+            if orm_rows:
+                return session.execute(stmt, execution_options=execution_options)
+            return session.connection().execute(
+                stmt, execution_options=execution_options
+            )
         except SQLAlchemyError as err:
             _LOGGER.error("Error executing query: %s", err)
             if tryno == RETRIES - 1:
@@ -273,7 +359,13 @@ def last_run_was_recently_clean(cursor: SQLiteCursor) -> bool:
     if not end_time or not end_time[0]:
         return False
 
-    last_run_end_time = process_timestamp(dt_util.parse_datetime(end_time[0]))
+    # The recorder stores the end time in ISO format; only fall back
+    # to the more lenient parser for anything else
+    try:
+        parsed_end_time: datetime | None = datetime.fromisoformat(end_time[0])
+    except ValueError:
+        parsed_end_time = dt_util.parse_datetime(end_time[0])
+    last_run_end_time = process_timestamp(parsed_end_time)
     assert last_run_end_time is not None
     now = dt_util.utcnow()
 
@@ -288,13 +380,7 @@ def last_run_was_recently_clean(cursor: SQLiteCursor) -> bool:
 def basic_sanity_check(cursor: SQLiteCursor) -> bool:
     """Check tables to make sure select does not fail."""
 
-    for table in TABLES_TO_CHECK:
-        if table in (TABLE_RECORDER_RUNS, TABLE_SCHEMA_CHANGES):
-            cursor.execute(f"SELECT * FROM {table};")  # noqa: S608 # not injection
-        else:
-            cursor.execute(
-                f"SELECT * FROM {table} LIMIT 1;"  # noqa: S608 # not injection
-            )
+    cursor.executescript(_SANITY_CHECK_SCRIPT)
 
     return True
 
@@ -304,9 +390,13 @@ def validate_sqlite_database(dbpath: str) -> bool:
     import sqlite3  # pylint: disable=import-outside-toplevel
 
     try:
-        conn = sqlite3.connect(dbpath)
-        run_checks_on_open_db(dbpath, conn.cursor())
-        conn.close()
+        # Open read-only since the checks never write and there is no need
+        # to set up a writer on the database before the recorder opens it
+        conn = sqlite3.connect(f"file:{quote(dbpath)}?mode=ro", uri=True)
+        try:
+            run_checks_on_open_db(dbpath, conn.cursor())
+        finally:
+            conn.close()
     except sqlite3.DatabaseError:
         _LOGGER.exception("The database at %s is corrupt or malformed", dbpath)
         return False
@@ -356,11 +446,16 @@ def move_away_broken_database(dbfile: str) -> None:
         f"{dbfile}{corrupt_postfix}",
     )
 
+    # List the directory once instead of checking each file
+    parent = os.path.dirname(dbfile) or "."
+    with os.scandir(parent) as entries:
+        existing = {entry.name for entry in entries}
+    base = os.path.basename(dbfile)
     for postfix in SQLITE3_POSTFIXES:
-        path = f"{dbfile}{postfix}"
-        if not os.path.exists(path):
+        if (name := f"{base}{postfix}") not in existing:
             continue
-        os.rename(path, f"{path}{corrupt_postfix}")
+        path = os.path.join(parent, name)
+        os.replace(path, f"{path}{corrupt_postfix}")
 
 
 def execute_on_connection(dbapi_connection: DBAPIConnection, statement: str) -> None:
@@ -424,10 +519,14 @@ def _extract_version_from_server_response(
         return None
 
 
+@functools.lru_cache(maxsize=DATETIME_CACHE_SIZE)
 def _datetime_or_none(value: str) -> datetime | None:
     """Fast version of mysqldb DateTime_or_None.
 
     https://github.com/PyMySQL/mysqlclient/blob/v2.1.0/MySQLdb/times.py#L66
+
+    The same timestamps repeat across many rows of a result, so the
+    parsed values are cached.
     """
     try:
         return ciso8601.parse_datetime(value)
@@ -435,8 +534,12 @@ def _datetime_or_none(value: str) -> datetime | None:
         return None
 
 
+@functools.cache
 def build_mysqldb_conv() -> dict:
-    """Build a MySQLDB conv dict that uses cisco8601 to parse datetimes."""
+    """Build a MySQLDB conv dict that uses cisco8601 to parse datetimes.
+
+    The dict is built once and shared since MySQLdb copies it per connection.
+    """
     # Late imports since we only call this if they are using mysqldb
     # pylint: disable=import-outside-toplevel
     from MySQLdb.constants import FIELD_TYPE
@@ -453,11 +556,12 @@ def _async_create_mariadb_range_index_regression_issue(
 
     The range scan issue was fixed in MariaDB 10.5.17, 10.6.9, 10.7.5, 10.8.4 and later.
     """
-    if version >= MARIA_DB_108:
+    version_tuple = _version_tuple(version)
+    if version_tuple >= _MARIA_DB_108:
         min_version = RECOMMENDED_MIN_VERSION_MARIA_DB_108
-    elif version >= MARIA_DB_107:
+    elif version_tuple >= _MARIA_DB_107:
         min_version = RECOMMENDED_MIN_VERSION_MARIA_DB_107
-    elif version >= MARIA_DB_106:
+    elif version_tuple >= _MARIA_DB_106:
         min_version = RECOMMENDED_MIN_VERSION_MARIA_DB_106
     else:
         min_version = RECOMMENDED_MIN_VERSION_MARIA_DB
@@ -473,25 +577,6 @@ def _async_create_mariadb_range_index_regression_issue(
     )
 
 
-def handle_sqlite_connection(dbapi_connection, first_connection, instance, version):
-    # SQLite-specific connection setup logic
-    # ...
-
-    def handle_mysql_connection(dbapi_connection, first_connection, instance, version):
-    # MySQL-specific connection setup logic
-    # ...
-
-        def handle_postgresql_connection(dbapi_connection, first_connection, version):
-    # PostgreSQL-specific connection setup logic
-    # ...
-
-            def check_version(version, version_string, db_name, min_version):
-    # Version checking logic
-                if not version or version < min_version:
-                    _fail_unsupported_version(
-            version or version_string, db_name, min_version
-        )
-
 def setup_connection_for_dialect(
     instance: Recorder,
     dialect_name: str,
@@ -501,18 +586,93 @@ def setup_connection_for_dialect(
     """Execute statements needed for dialect connection."""
     version: AwesomeVersion | None = None
     slow_range_in_select = False
-
     if dialect_name == SupportedDialect.SQLITE:
-        version = handle_sqlite_connection(dbapi_connection, first_connection, instance, version)
-        check_version(version, version_string, "SQLite", MIN_VERSION_SQLITE)
+        if first_connection:
+            old_isolation = dbapi_connection.isolation_level  # type: ignore[attr-defined]
+            dbapi_connection.isolation_level = None  # type: ignore[attr-defined]
+            execute_on_connection(dbapi_connection, "PRAGMA journal_mode=WAL")
+            dbapi_connection.isolation_level = old_isolation  # type: ignore[attr-defined]
+            # WAL mode only needs to be setup once
+            # instead of every time we open the sqlite connection
+            # as its persistent and isn't free to call every time.
+            result = query_on_connection(dbapi_connection, "SELECT sqlite_version()")
+            version_string = result[0][0]
+            version = _extract_version_from_server_response(version_string)
+
+            if not version or _version_tuple(version) < _MIN_VERSION_SQLITE:
+                _fail_unsupported_version(
+                    version or version_string, "SQLite", MIN_VERSION_SQLITE
+                )
+
+        # The upper bound on the cache size is approximately 16MiB of memory
+        execute_on_connection(dbapi_connection, "PRAGMA cache_size = -16384")
+
+        #
+        # Enable FULL synchronous if they have a commit interval of 0
+        # or NORMAL if they do not.
+        #
+        # https://sqlite.org/pragma.html#pragma_synchronous
+        # The synchronous=NORMAL setting is a good choice for most applications
+        # running in WAL mode.
+        #
+        synchronous = "NORMAL" if instance.commit_interval else "FULL"
+        execute_on_connection(dbapi_connection, f"PRAGMA synchronous={synchronous}")
+
+        # enable support for foreign keys
+        execute_on_connection(dbapi_connection, "PRAGMA foreign_keys=ON")
 
     elif dialect_name == SupportedDialect.MYSQL:
-        version = handle_mysql_connection(dbapi_connection, first_connection, instance, version)
-        check_version(version, version_string, "MySQL", MIN_VERSION_MYSQL)
+        execute_on_connection(dbapi_connection, "SET session wait_timeout=28800")
+        if first_connection:
+            result = query_on_connection(dbapi_connection, "SELECT VERSION()")
+            version_string = result[0][0]
+            version = _extract_version_from_server_response(version_string)
+            version_tuple = _version_tuple(version) if version else None
+            is_maria_db = "mariadb" in version_string.lower()
+
+            if is_maria_db:
+                if not version_tuple or version_tuple < _MIN_VERSION_MARIA_DB:
+                    _fail_unsupported_version(
+                        version or version_string, "MariaDB", MIN_VERSION_MARIA_DB
+                    )
+                if version_tuple and _is_in_version_ranges(
+                    version_tuple, _MARIADB_RANGE_INDEX_REGRESSION
+                ):
+                    instance.hass.add_job(
+                        _async_create_mariadb_range_index_regression_issue,
+                        instance.hass,
+                        version,
+                    )
+
+            else:
+                if not version_tuple or version_tuple < _MIN_VERSION_MYSQL:
+                    _fail_unsupported_version(
+                        version or version_string, "MySQL", MIN_VERSION_MYSQL
+                    )
+
+            slow_range_in_select = bool(
+                not version_tuple
+                or _is_in_version_ranges(version_tuple, _MARIADB_SLOW_RANGE_IN_SELECT)
+            )
 
+        # Ensure all times are using UTC to avoid issues with daylight savings
+        execute_on_connection(dbapi_connection, "SET time_zone = '+00:00'")
     elif dialect_name == SupportedDialect.POSTGRESQL:
-        version = handle_postgresql_connection(dbapi_connection, first_connection, version)
-        check_version(version, version_string, "PostgreSQL", MIN_VERSION_PGSQL)
+        # Historically we have marked PostgreSQL as having slow range in select
+        # but this may not be true for all versions. We should investigate
+        # this further when we have more data and remove this if possible
+        # in the future so we can use the simpler purge SQL query for
+        # _select_unused_attributes_ids and _select_unused_events_ids
+        slow_range_in_select = True
+        if first_connection:
+            # server_version_num was added in 2006
+            result = query_on_connection(dbapi_connection, "SHOW server_version")
+            version_string = result[0][0]
+            version = _extract_version_from_server_response(version_string)
+            if not version or _version_tuple(version) < _MIN_VERSION_PGSQL:
+                _fail_unsupported_version(
+                    version or version_string, "PostgreSQL", MIN_VERSION_PGSQL
+                )
 
     else:
         _fail_unsupported_dialect(dialect_name)
@@ -523,29 +683,29 @@ def setup_connection_for_dialect(
     return DatabaseEngine(
         dialect=SupportedDialect(dialect_name),
         version=version,
-        optimizer=DatabaseOptimizer(slow_range_in_select=slow_range_in_select)
-        )
+        optimizer=DatabaseOptimizer(slow_range_in_select=slow_range_in_select),
+    )
 
 
 def end_incomplete_runs(session: Session, start_time: datetime) -> None:
     """End any incomplete recorder runs."""
+    # The runs are already attached to the session by the query, so the
+    # unit of work picks up the changes on flush without session.add
     for run in session.query(RecorderRuns).filter_by(end=None):
         run.closed_incorrect = True
         run.end = start_time
         _LOGGER.warning(
             "Ended unfinished session (id=%s from %s)", run.run_id, run.start
         )
-        session.add(run)
 
 
 def _is_retryable_error(instance: Recorder, err: OperationalError) -> bool:
     """Return True if the error is retryable."""
-    assert instance.engine is not None
     return bool(
-        instance.engine.dialect.name == SupportedDialect.MYSQL
+        instance.dialect_name == SupportedDialect.MYSQL
         and isinstance(err.orig, BaseException)
         and err.orig.args
-        and err.orig.args[0] in RETRYABLE_MYSQL_ERRORS
+        and err.orig.args[0] in _RETRYABLE_MYSQL_ERRORS_SET
     )
 
 
@@ -635,8 +795,10 @@ def periodic_db_cleanups(instance: Recorder) -> None:
         # Execute sqlite to create a wal checkpoint and free up disk space
         _LOGGER.debug("WAL checkpoint")
         with instance.engine.connect() as connection:
-            connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE);"))
-            connection.execute(text("PRAGMA OPTIMIZE;"))
+            # pysqlite only runs more than one statement per call as a script
+            connection.connection.executescript(
+                "PRAGMA wal_checkpoint(TRUNCATE);PRAGMA OPTIMIZE;"
+            )
 
 
 @contextmanager
@@ -681,20 +843,34 @@ def async_migration_is_live(hass: HomeAssistant) -> bool:
     return instance.migration_is_live
 
 
+@functools.lru_cache(maxsize=256)
+def _second_sunday_day(year: int, month: int) -> int:
+    """Return the day of the month of the second sunday of a month.
+
+    Uses Sakamoto's method to find the day of the week of the first
+    possible second sunday (0 is sunday) without building a date.
+    """
+    if month < 3:
+        year -= 1
+    day_of_week = (
+        year
+        + year // 4
+        - year // 100
+        + year // 400
+        + _SAKAMOTO_MONTH_OFFSETS[month - 1]
+        + FIRST_POSSIBLE_SUNDAY
+    ) % DAYS_IN_WEEK
+    return FIRST_POSSIBLE_SUNDAY + (DAYS_IN_WEEK - day_of_week) % DAYS_IN_WEEK
+
+
 def second_sunday(year: int, month: int) -> date:
     """Return the datetime.date for the second sunday of a month."""
-    second = date(year, month, FIRST_POSSIBLE_SUNDAY)
-    day_of_week = second.weekday()
-    if day_of_week == SUNDAY_WEEKDAY:
-        return second
-    return second.replace(
-        day=(FIRST_POSSIBLE_SUNDAY + (SUNDAY_WEEKDAY - day_of_week) % DAYS_IN_WEEK)
-    )
+    return date(year, month, _second_sunday_day(year, month))
 
 
 def is_second_sunday(date_time: datetime) -> bool:
     """Check if a time is the second sunday of the month."""
-    return bool(second_sunday(date_time.year, date_time.month).day == date_time.day)
+    return _second_sunday_day(date_time.year, date_time.month) == date_time.day
 
 
 def get_instance(hass: HomeAssistant) -> Recorder:
@@ -707,7 +883,9 @@ PERIOD_SCHEMA = vol.Schema(
     {
         vol.Exclusive("calendar", "period"): vol.Schema(
             {
-                vol.Required("period"): vol.Any("hour", "day", "week", "month", "year"),
+                vol.Required("period"): vol.In(
+                    ("hour", "day", "week", "month", "year")
+                ),
                 vol.Optional("offset"): int,
             }
         ),
@@ -727,6 +905,52 @@ PERIOD_SCHEMA = vol.Schema(
 )
 
 
+def _resolve_calendar_hour(cal_offset: int) -> tuple[datetime, datetime]:
+    """Return the local start and end of the calendar hour."""
+    start_time = dt_util.now().replace(minute=0, second=0, microsecond=0)
+    start_time += _ONE_HOUR * cal_offset
+    return start_time, start_time + _ONE_HOUR
+
+
+def _resolve_calendar_day(cal_offset: int) -> tuple[datetime, datetime]:
+    """Return the local start and end of the calendar day."""
+    start_time = dt_util.start_of_local_day() + _ONE_DAY * cal_offset
+    return start_time, start_time + _ONE_DAY
+
+
+def _resolve_calendar_week(cal_offset: int) -> tuple[datetime, datetime]:
+    """Return the local start and end of the calendar week."""
+    start_of_day = dt_util.start_of_local_day()
+    start_time = start_of_day - timedelta(days=start_of_day.weekday())
+    start_time += _ONE_WEEK * cal_offset
+    return start_time, start_time + _ONE_WEEK
+
+
+def _resolve_calendar_month(cal_offset: int) -> tuple[datetime, datetime]:
+    """Return the local start and end of the calendar month."""
+    start_time = dt_util.start_of_local_day().replace(day=28)
+    # This works for up to 48 months of offset
+    start_time = (start_time + timedelta(days=cal_offset * 31)).replace(day=1)
+    return start_time, (start_time + timedelta(days=31)).replace(day=1)
+
+
+def _resolve_calendar_year(cal_offset: int) -> tuple[datetime, datetime]:
+    """Return the local start and end of the calendar year."""
+    start_time = dt_util.start_of_local_day().replace(month=12, day=31)
+    # This works for 100+ years of offset
+    start_time = (start_time + timedelta(days=cal_offset * 366)).replace(month=1, day=1)
+    return start_time, (start_time + timedelta(days=365)).replace(day=1)
+
+
+_CALENDAR_PERIOD_RESOLVERS: dict[str, Callable[[int], tuple[datetime, datetime]]] = {
+    "hour": _resolve_calendar_hour,
+    "day": _resolve_calendar_day,
+    "week": _resolve_calendar_week,
+    "month": _resolve_calendar_month,
+    "year": _resolve_calendar_year,
+}
+
+
 def resolve_period(
     period_def: StatisticPeriod,
 ) -> tuple[datetime | None, datetime | None]:
@@ -735,34 +959,10 @@ def resolve_period(
     end_time = None
 
     if "calendar" in period_def:
-        calendar_period = period_def["calendar"]["period"]
-        start_of_day = dt_util.start_of_local_day()
-        cal_offset = period_def["calendar"].get("offset", 0)
-        if calendar_period == "hour":
-            start_time = dt_util.now().replace(minute=0, second=0, microsecond=0)
-            start_time += timedelta(hours=cal_offset)
-            end_time = start_time + timedelta(hours=1)
-        elif calendar_period == "day":
-            start_time = start_of_day
-            start_time += timedelta(days=cal_offset)
-            end_time = start_time + timedelta(days=1)
-        elif calendar_period == "week":
-            start_time = start_of_day - timedelta(days=start_of_day.weekday())
-            start_time += timedelta(days=cal_offset * 7)
-            end_time = start_time + timedelta(weeks=1)
-        elif calendar_period == "month":
-            start_time = start_of_day.replace(day=28)
-            # This works for up to 48 months of offset
-            start_time = (start_time + timedelta(days=cal_offset * 31)).replace(day=1)
-            end_time = (start_time + timedelta(days=31)).replace(day=1)
-        else:  # calendar_period = "year"
-            start_time = start_of_day.replace(month=12, day=31)
-            # This works for 100+ years of offset
-            start_time = (start_time + timedelta(days=cal_offset * 366)).replace(
-                month=1, day=1
-            )
-            end_time = (start_time + timedelta(days=365)).replace(day=1)
-
+        calendar = period_def["calendar"]
+        start_time, end_time = _CALENDAR_PERIOD_RESOLVERS[calendar["period"]](
+            calendar.get("offset", 0)
+        )
         start_time = dt_util.as_utc(start_time)
         end_time = dt_util.as_utc(end_time)
 
@@ -783,35 +983,70 @@ def resolve_period(
     return (start_time, end_time)
 
 
-def take(take_num: int, iterable: Iterable) -> list[Any]:
-    """Return first n items of the iterable as a list.
-
-    From itertools recipes
-    """
-    return list(islice(iterable, take_num))
-
-
 def chunked(iterable: Iterable, chunked_num: int) -> Iterable[Any]:
     """Break *iterable* into lists of length *n*.
 
     From more-itertools
     """
-    return iter(partial(take, chunked_num, iter(iterable)), [])
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, chunked_num)):
+        yield chunk
 
 
 def get_index_by_name(session: Session, table_name: str, index_name: str) -> str | None:
     """Get an index by name."""
     connection = session.connection()
-    inspector = inspect(connection)
-    indexes = inspector.get_indexes(table_name)
+    dialect_name = connection.dialect.name
+    # Query the index names directly where possible instead of having
+    # the inspector reflect the full definition of every index
+    index_names: Iterable[str | None]
+    if dialect_name == SupportedDialect.SQLITE:
+        # Skip the indexes SQLite creates automatically for
+        # UNIQUE and PRIMARY KEY constraints since they cannot be dropped
+        index_names = [
+            row[1]
+            for row in connection.execute(
+                text(f'PRAGMA index_list("{table_name}")')
+            ).all()
+            if not row[1].startswith("sqlite_autoindex_")
+        ]
+    elif dialect_name == SupportedDialect.MYSQL:
+        index_names = (
+            connection.execute(
+                text(
+                    "SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS"
+                    " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+                ),
+                {"table_name": table_name},
+            )
+            .scalars()
+            .all()
+        )
+    elif dialect_name == SupportedDialect.POSTGRESQL:
+        index_names = (
+            connection.execute(
+                text(
+                    "SELECT indexname FROM pg_indexes"
+                    " WHERE schemaname = current_schema() AND tablename = :table_name"
+                ),
+                {"table_name": table_name},
+            )
+            .scalars()
+            .all()
+        )
+    else:
+        index_names = (
+            possible_index["name"]
+            for possible_index in inspect(connection).get_indexes(table_name)
+        )
     return next(
         (
-            possible_index["name"]
-            for possible_index in indexes
-            if possible_index["name"]
+            possible_index_name
+            for possible_index_name in index_names
+            if possible_index_name
             and (
-                possible_index["name"] == index_name
-                or possible_index["name"].endswith(f"_{index_name}")
+                possible_index_name == index_name
+                or possible_index_name.endswith(f"_{index_name}")
             )
         ),
         None,
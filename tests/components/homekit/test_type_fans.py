@@ -1,5 +1,8 @@
 """Test different accessory types: Fans."""
+from datetime import timedelta
+
 from pyhap.const import HAP_REPR_AID, HAP_REPR_CHARS, HAP_REPR_IID, HAP_REPR_VALUE
+import pytest
 
 from homeassistant.components.fan import (
     ATTR_DIRECTION,
@@ -14,7 +17,10 @@ from homeassistant.components.fan import (
     FanEntityFeature,
 )
 from homeassistant.components.homekit.const import ATTR_VALUE, PROP_MIN_STEP
-from homeassistant.components.homekit.type_fans import Fan
+from homeassistant.components.homekit.type_fans import (
+    CHANGE_COALESCE_TIME_WINDOW,
+    Fan,
+)
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     ATTR_SUPPORTED_FEATURES,
@@ -25,8 +31,18 @@ from homeassistant.const import (
 )
 from homeassistant.core import CoreState, HomeAssistant
 from homeassistant.helpers import entity_registry as er
+import homeassistant.util.dt as dt_util
+
+from .util import async_capture_char_updates
 
-from tests.common import async_mock_service
+from tests.common import async_fire_time_changed, async_mock_service
+
+
+async def _wait_for_fan_coalesce(hass):
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=CHANGE_COALESCE_TIME_WINDOW)
+    )
+    await hass.async_block_till_done()
 
 
 async def test_fan_basic(hass: HomeAssistant, hk_driver, events) -> None:
@@ -79,7 +95,7 @@ async def test_fan_basic(hass: HomeAssistant, hk_driver, events) -> None:
         },
         "mock_addr",
     )
-    await hass.async_block_till_done()
+    await _wait_for_fan_coalesce(hass)
     assert call_turn_on
     assert call_turn_on[0].data[ATTR_ENTITY_ID] == entity_id
     assert len(events) == 1
@@ -100,7 +116,7 @@ async def test_fan_basic(hass: HomeAssistant, hk_driver, events) -> None:
         },
         "mock_addr",
     )
-    await hass.async_block_till_done()
+    await _wait_for_fan_coalesce(hass)
     assert call_turn_off
     assert call_turn_off[0].data[ATTR_ENTITY_ID] == entity_id
     assert len(events) == 2
@@ -150,7 +166,7 @@ async def test_fan_direction(hass: HomeAssistant, hk_driver, events) -> None:
         },
         "mock_addr",
     )
-    await hass.async_block_till_done()
+    await _wait_for_fan_coalesce(hass)
     assert call_set_direction[0]
     assert call_set_direction[0].data[ATTR_ENTITY_ID] == entity_id
     assert call_set_direction[0].data[ATTR_DIRECTION] == DIRECTION_FORWARD
@@ -170,7 +186,7 @@ async def test_fan_direction(hass: HomeAssistant, hk_driver, events) -> None:
         "mock_addr",
     )
     acc.char_direction.client_update_value(1)
-    await hass.async_block_till_done()
+    await _wait_for_fan_coalesce(hass)
     assert call_set_direction[1]
     assert call_set_direction[1].data[ATTR_ENTITY_ID] == entity_id
     assert call_set_direction[1].data[ATTR_DIRECTION] == DIRECTION_REVERSE
@@ -219,7 +235,7 @@ async def test_fan_oscillate(hass: HomeAssistant, hk_driver, events) -> None:
         "mock_addr",
     )
     acc.char_swing.client_update_value(0)
-    await hass.async_block_till_done()
+    await _wait_for_fan_coalesce(hass)
     assert call_oscillate[0]
     assert call_oscillate[0].data[ATTR_ENTITY_ID] == entity_id
     assert call_oscillate[0].data[ATTR_OSCILLATING] is False
@@ -239,7 +255,7 @@ async def test_fan_oscillate(hass: HomeAssistant, hk_driver, events) -> None:
         "mock_addr",
     )
     acc.char_swing.client_update_value(1)
-    await hass.async_block_till_done()
+    await _wait_for_fan_coalesce(hass)
     assert call_oscillate[1]
     assert call_oscillate[1].data[ATTR_ENTITY_ID] == entity_id
     assert call_oscillate[1].data[ATTR_OSCILLATING] is True
@@ -295,7 +311,7 @@ async def test_fan_speed(hass: HomeAssistant, hk_driver, events) -> None:
         "mock_addr",
     )
     acc.char_speed.client_update_value(42)
-    await hass.async_block_till_done()
+    await _wait_for_fan_coalesce(hass)
     assert acc.char_speed.value == 50
     assert acc.char_active.value == 1
 
@@ -325,7 +341,7 @@ async def test_fan_speed(hass: HomeAssistant, hk_driver, events) -> None:
         },
         "mock_addr",
     )
-    await hass.async_block_till_done()
+    await _wait_for_fan_coalesce(hass)
     assert acc.char_speed.value == 50
     assert acc.char_active.value == 1
 
@@ -333,6 +349,69 @@ async def test_fan_speed(hass: HomeAssistant, hk_driver, events) -> None:
     assert call_turn_on[0].data[ATTR_ENTITY_ID] == entity_id
 
 
+async def test_fan_coalesce_separate_writes(
+    hass: HomeAssistant, hk_driver, events
+) -> None:
+    """Test writes to active and speed in separate requests send one turn on."""
+    entity_id = "fan.demo"
+
+    hass.states.async_set(
+        entity_id,
+        STATE_OFF,
+        {
+            ATTR_SUPPORTED_FEATURES: FanEntityFeature.SET_SPEED,
+            ATTR_PERCENTAGE: 0,
+        },
+    )
+    await hass.async_block_till_done()
+    acc = Fan(hass, hk_driver, "Fan", entity_id, 1, None)
+    hk_driver.add_accessory(acc)
+
+    await acc.run()
+    await hass.async_block_till_done()
+
+    # Set from HomeKit
+    call_turn_on = async_mock_service(hass, DOMAIN, "turn_on")
+    call_set_percentage = async_mock_service(hass, DOMAIN, "set_percentage")
+
+    char_active_iid = acc.char_active.to_HAP()[HAP_REPR_IID]
+    char_speed_iid = acc.char_speed.to_HAP()[HAP_REPR_IID]
+
+    # HomeKit sends active and speed as two requests when turning on
+    # the fan with a speed, both arrive within the coalesce window
+    hk_driver.set_characteristics(
+        {
+            HAP_REPR_CHARS: [
+                {
+                    HAP_REPR_AID: acc.aid,
+                    HAP_REPR_IID: char_active_iid,
+                    HAP_REPR_VALUE: 1,
+                },
+            ]
+        },
+        "mock_addr",
+    )
+    hk_driver.set_characteristics(
+        {
+            HAP_REPR_CHARS: [
+                {
+                    HAP_REPR_AID: acc.aid,
+                    HAP_REPR_IID: char_speed_iid,
+                    HAP_REPR_VALUE: 42,
+                },
+            ]
+        },
+        "mock_addr",
+    )
+    await _wait_for_fan_coalesce(hass)
+    assert not call_set_percentage
+    assert len(call_turn_on) == 1
+    assert call_turn_on[0].data[ATTR_ENTITY_ID] == entity_id
+    assert call_turn_on[0].data[ATTR_PERCENTAGE] == 42
+    assert len(events) == 1
+    assert events[-1].data[ATTR_VALUE] == 42
+
+
 async def test_fan_set_all_one_shot(hass: HomeAssistant, hk_driver, events) -> None:
     """Test fan with speed."""
     entity_id = "fan.demo"
@@ -413,11 +492,11 @@ async def test_fan_set_all_one_shot(hass: HomeAssistant, hk_driver, events) -> N
         },
         "mock_addr",
     )
-    await hass.async_block_till_done()
-    assert not call_turn_on
-    assert call_set_percentage[0]
-    assert call_set_percentage[0].data[ATTR_ENTITY_ID] == entity_id
-    assert call_set_percentage[0].data[ATTR_PERCENTAGE] == 42
+    await _wait_for_fan_coalesce(hass)
+    assert not call_set_percentage
+    assert len(call_turn_on) == 1
+    assert call_turn_on[0].data[ATTR_ENTITY_ID] == entity_id
+    assert call_turn_on[0].data[ATTR_PERCENTAGE] == 42
     assert call_oscillate[0]
     assert call_oscillate[0].data[ATTR_ENTITY_ID] == entity_id
     assert call_oscillate[0].data[ATTR_OSCILLATING] is True
@@ -471,13 +550,13 @@ async def test_fan_set_all_one_shot(hass: HomeAssistant, hk_driver, events) -> N
         },
         "mock_addr",
     )
-    # Turn on should not be called if its already on
-    # and we set a fan speed
-    await hass.async_block_till_done()
+    # The speed is sent with turn on even if its already on
+    await _wait_for_fan_coalesce(hass)
     assert len(events) == 6
-    assert call_set_percentage[1]
-    assert call_set_percentage[1].data[ATTR_ENTITY_ID] == entity_id
-    assert call_set_percentage[1].data[ATTR_PERCENTAGE] == 42
+    assert not call_set_percentage
+    assert len(call_turn_on) == 2
+    assert call_turn_on[1].data[ATTR_ENTITY_ID] == entity_id
+    assert call_turn_on[1].data[ATTR_PERCENTAGE] == 42
     assert call_oscillate[1]
     assert call_oscillate[1].data[ATTR_ENTITY_ID] == entity_id
     assert call_oscillate[1].data[ATTR_OSCILLATING] is True
@@ -516,16 +595,57 @@ async def test_fan_set_all_one_shot(hass: HomeAssistant, hk_driver, events) -> N
         },
         "mock_addr",
     )
-    await hass.async_block_till_done()
+    await _wait_for_fan_coalesce(hass)
 
     assert len(events) == 7
     assert call_turn_off
     assert call_turn_off[0].data[ATTR_ENTITY_ID] == entity_id
-    assert len(call_set_percentage) == 2
+    assert len(call_turn_on) == 2
+    assert not call_set_percentage
     assert len(call_oscillate) == 2
     assert len(call_set_direction) == 2
 
 
+@pytest.mark.parametrize(
+    ("changed_attributes", "expected_writes"),
+    [
+        ({ATTR_PERCENTAGE_STEP: 25, "not_exposed": True}, []),
+        ({ATTR_DIRECTION: DIRECTION_REVERSE}, [("char_direction", 1)]),
+        ({ATTR_OSCILLATING: False}, [("char_swing", 0)]),
+        ({ATTR_PERCENTAGE: 50}, [("char_speed", 50)]),
+    ],
+)
+async def test_fan_only_writes_changed_characteristics(
+    hass: HomeAssistant, hk_driver, events, changed_attributes, expected_writes
+) -> None:
+    """Test only characteristics whose HomeKit value changed are written."""
+    entity_id = "fan.demo"
+    attributes = {
+        ATTR_SUPPORTED_FEATURES: FanEntityFeature.SET_SPEED
+        | FanEntityFeature.DIRECTION
+        | FanEntityFeature.OSCILLATE,
+        ATTR_PERCENTAGE: 100,
+        ATTR_PERCENTAGE_STEP: 1,
+        ATTR_DIRECTION: DIRECTION_FORWARD,
+        ATTR_OSCILLATING: True,
+    }
+
+    hass.states.async_set(entity_id, STATE_ON, attributes)
+    await hass.async_block_till_done()
+    acc = Fan(hass, hk_driver, "Fan", entity_id, 1, None)
+    hk_driver.add_accessory(acc)
+
+    await acc.run()
+    await hass.async_block_till_done()
+
+    writes, _ = await async_capture_char_updates(
+        hass, entity_id, STATE_ON, {**attributes, **changed_attributes}
+    )
+    assert writes == [
+        (getattr(acc, char_name), value) for char_name, value in expected_writes
+    ]
+
+
 async def test_fan_restore(hass: HomeAssistant, hk_driver, events) -> None:
     """Test setting up an entity from state in the event registry."""
     hass.state = CoreState.not_running
@@ -692,7 +812,7 @@ async def test_fan_single_preset_mode(hass: HomeAssistant, hk_driver, events) ->
         },
         "mock_addr",
     )
-    await hass.async_block_till_done()
+    await _wait_for_fan_coalesce(hass)
     assert call_turn_on[0]
     assert call_turn_on[0].data[ATTR_ENTITY_ID] == entity_id
     assert call_turn_on[0].data[ATTR_PERCENTAGE] == 42
@@ -711,7 +831,7 @@ async def test_fan_single_preset_mode(hass: HomeAssistant, hk_driver, events) ->
         },
         "mock_addr",
     )
-    await hass.async_block_till_done()
+    await _wait_for_fan_coalesce(hass)
     assert call_set_preset_mode[0]
     assert call_set_preset_mode[0].data[ATTR_ENTITY_ID] == entity_id
     assert call_set_preset_mode[0].data[ATTR_PRESET_MODE] == "smart"
@@ -731,3 +851,94 @@ async def test_fan_single_preset_mode(hass: HomeAssistant, hk_driver, events) ->
     )
     await hass.async_block_till_done()
     assert acc.char_target_fan_state.value == 0
+
+
+async def test_fan_turn_on_with_single_preset_mode(
+    hass: HomeAssistant, hk_driver, events
+) -> None:
+    """Test turning on with a single preset mode sends one turn on call."""
+    entity_id = "fan.demo"
+
+    hass.states.async_set(
+        entity_id,
+        STATE_OFF,
+        {
+            ATTR_SUPPORTED_FEATURES: FanEntityFeature.PRESET_MODE
+            | FanEntityFeature.SET_SPEED,
+            ATTR_PERCENTAGE: 42,
+            ATTR_PRESET_MODE: None,
+            ATTR_PRESET_MODES: ["smart"],
+        },
+    )
+    await hass.async_block_till_done()
+    acc = Fan(hass, hk_driver, "Fan", entity_id, 1, None)
+    hk_driver.add_accessory(acc)
+
+    await acc.run()
+    await hass.async_block_till_done()
+
+    # Set from HomeKit
+    call_set_percentage = async_mock_service(hass, DOMAIN, "set_percentage")
+    call_set_preset_mode = async_mock_service(hass, DOMAIN, "set_preset_mode")
+    call_turn_on = async_mock_service(hass, DOMAIN, "turn_on")
+
+    char_active_iid = acc.char_active.to_HAP()[HAP_REPR_IID]
+    char_speed_iid = acc.char_speed.to_HAP()[HAP_REPR_IID]
+    char_target_fan_state_iid = acc.char_target_fan_state.to_HAP()[HAP_REPR_IID]
+
+    hk_driver.set_characteristics(
+        {
+            HAP_REPR_CHARS: [
+                {
+                    HAP_REPR_AID: acc.aid,
+                    HAP_REPR_IID: char_active_iid,
+                    HAP_REPR_VALUE: 1,
+                },
+                {
+                    HAP_REPR_AID: acc.aid,
+                    HAP_REPR_IID: char_speed_iid,
+                    HAP_REPR_VALUE: 60,
+                },
+                {
+                    HAP_REPR_AID: acc.aid,
+                    HAP_REPR_IID: char_target_fan_state_iid,
+                    HAP_REPR_VALUE: 1,
+                },
+            ]
+        },
+        "mock_addr",
+    )
+    await _wait_for_fan_coalesce(hass)
+    assert len(call_turn_on) == 1
+    assert call_turn_on[0].data == {
+        ATTR_ENTITY_ID: entity_id,
+        ATTR_PRESET_MODE: "smart",
+    }
+    assert len(events) == 1
+    assert events[-1].data[ATTR_VALUE] == "smart"
+
+    hk_driver.set_characteristics(
+        {
+            HAP_REPR_CHARS: [
+                {
+                    HAP_REPR_AID: acc.aid,
+                    HAP_REPR_IID: char_active_iid,
+                    HAP_REPR_VALUE: 1,
+                },
+                {
+                    HAP_REPR_AID: acc.aid,
+                    HAP_REPR_IID: char_target_fan_state_iid,
+                    HAP_REPR_VALUE: 0,
+                },
+            ]
+        },
+        "mock_addr",
+    )
+    await _wait_for_fan_coalesce(hass)
+    assert len(call_turn_on) == 2
+    assert call_turn_on[1].data == {ATTR_ENTITY_ID: entity_id, ATTR_PERCENTAGE: 42}
+    assert len(events) == 2
+    assert events[-1].data[ATTR_VALUE] == 42
+
+    assert not call_set_percentage
+    assert not call_set_preset_mode
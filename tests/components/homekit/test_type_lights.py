@@ -38,10 +38,12 @@ from homeassistant.const import (
     STATE_ON,
     STATE_UNKNOWN,
 )
-from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.core import CoreState, HomeAssistant, State
 from homeassistant.helpers import entity_registry as er
 import homeassistant.util.dt as dt_util
 
+from .util import async_capture_char_updates
+
 from tests.common import async_fire_time_changed, async_mock_service
 
 
@@ -545,6 +547,110 @@ async def test_light_rgb_color(
     assert events[-1].data[ATTR_VALUE] == "set color at (145, 75)"
 
 
+async def test_light_ignores_non_numeric_attributes(
+    hass: HomeAssistant, hk_driver, events
+) -> None:
+    """Test non-numeric brightness, color and color temperature are ignored."""
+    entity_id = "light.demo"
+    attributes = {
+        ATTR_SUPPORTED_COLOR_MODES: [ColorMode.COLOR_TEMP, ColorMode.HS],
+        ATTR_COLOR_MODE: ColorMode.HS,
+        ATTR_BRIGHTNESS: 255,
+        ATTR_HS_COLOR: (260, 90),
+    }
+
+    hass.states.async_set(entity_id, STATE_ON, attributes)
+    await hass.async_block_till_done()
+    acc = Light(hass, hk_driver, "Light", entity_id, 1, None)
+    hk_driver.add_accessory(acc)
+
+    await acc.run()
+    await hass.async_block_till_done()
+    color_temp = acc.char_color_temp.value
+
+    # The states are passed in directly so an exception is not
+    # swallowed by the state change event dispatcher
+    acc.async_update_state(
+        State(
+            entity_id,
+            STATE_ON,
+            {**attributes, ATTR_BRIGHTNESS: "bright", ATTR_HS_COLOR: ("red", "blue")},
+        )
+    )
+    acc.async_update_state(
+        State(
+            entity_id,
+            STATE_ON,
+            {
+                **attributes,
+                ATTR_COLOR_MODE: ColorMode.COLOR_TEMP,
+                ATTR_COLOR_TEMP_KELVIN: "warm",
+            },
+        )
+    )
+    assert acc.char_on.value == 1
+    assert acc.char_brightness.value == 100
+    assert acc.char_hue.value == 260
+    assert acc.char_saturation.value == 90
+    assert acc.char_color_temp.value == color_temp
+
+
+@pytest.mark.parametrize(
+    ("changed_attributes", "expected_writes", "expected_notifies"),
+    [
+        ({"not_exposed": True}, [], []),
+        ({ATTR_BRIGHTNESS: 128}, [("char_brightness", 50)], []),
+        # A color mode change notifies HomeKit even if the values are the same
+        (
+            {ATTR_COLOR_MODE: ColorMode.HS},
+            [],
+            ["char_brightness", "char_hue", "char_saturation", "char_color_temp"],
+        ),
+        (
+            {ATTR_COLOR_MODE: ColorMode.HS, ATTR_BRIGHTNESS: 128},
+            [("char_brightness", 50)],
+            ["char_brightness", "char_hue", "char_saturation", "char_color_temp"],
+        ),
+    ],
+)
+async def test_light_only_writes_changed_characteristics(
+    hass: HomeAssistant,
+    hk_driver,
+    events,
+    changed_attributes,
+    expected_writes,
+    expected_notifies,
+) -> None:
+    """Test only changed characteristics are written but a mode change notifies."""
+    entity_id = "light.demo"
+    attributes = {
+        ATTR_SUPPORTED_COLOR_MODES: [ColorMode.COLOR_TEMP, ColorMode.HS],
+        ATTR_COLOR_MODE: ColorMode.COLOR_TEMP,
+        ATTR_BRIGHTNESS: 255,
+        ATTR_COLOR_TEMP_KELVIN: 5263,
+    }
+
+    hass.states.async_set(entity_id, STATE_ON, attributes)
+    await hass.async_block_till_done()
+    acc = Light(hass, hk_driver, "Light", entity_id, 1, None)
+    hk_driver.add_accessory(acc)
+
+    await acc.run()
+    await hass.async_block_till_done()
+    assert acc.char_brightness.value == 100
+    assert acc.char_color_temp.value == 190
+    assert acc.char_hue.value == 27
+    assert acc.char_saturation.value == 16
+
+    writes, notifies = await async_capture_char_updates(
+        hass, entity_id, STATE_ON, {**attributes, **changed_attributes}
+    )
+    assert writes == [
+        (getattr(acc, char_name), value) for char_name, value in expected_writes
+    ]
+    assert notifies == [getattr(acc, char_name) for char_name in expected_notifies]
+
+
 async def test_light_restore(hass: HomeAssistant, hk_driver, events) -> None:
     """Test setting up an entity from state in the event registry."""
     hass.state = CoreState.not_running
@@ -1,7 +1,10 @@
 """Test util for the homekit integration."""
 
+from typing import Any
 from unittest.mock import patch
 
+from pyhap.characteristic import Characteristic
+
 from homeassistant.components.homekit.const import DOMAIN
 from homeassistant.const import CONF_NAME, CONF_PORT
 from homeassistant.core import HomeAssistant
@@ -32,3 +35,20 @@ async def async_init_entry(hass: HomeAssistant, entry: MockConfigEntry):
         assert await hass.config_entries.async_setup(entry.entry_id)
         await hass.async_block_till_done()
         return entry
+
+
+async def async_capture_char_updates(
+    hass: HomeAssistant, entity_id: str, state: str, attributes: dict[str, Any]
+) -> tuple[list[tuple[Characteristic, Any]], list[Characteristic]]:
+    """Set a state and return the characteristic writes and notifies it caused."""
+
+    with patch.object(
+        Characteristic, "set_value", autospec=True
+    ) as mock_set_value, patch.object(
+        Characteristic, "notify", autospec=True
+    ) as mock_notify:
+        hass.states.async_set(entity_id, state, attributes)
+        await hass.async_block_till_done()
+    return [
+        set_value_call.args[:2] for set_value_call in mock_set_value.call_args_list
+    ], [notify_call.args[0] for notify_call in mock_notify.call_args_list]
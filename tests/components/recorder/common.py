@@ -368,7 +368,7 @@ def convert_pending_events_to_event_types(instance: Recorder, session: Session)
         event.event_type_rel = event_types_objects[event_type]
 
     for event_type in manually_added_event_types:
-        instance.event_type_manager._non_existent_event_types.pop(event_type, None)
+        instance.event_type_manager._non_existent_event_types.discard(event_type)
 
 
 def create_engine_test_for_schema_version_postfix(
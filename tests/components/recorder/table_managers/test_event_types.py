@@ -0,0 +1,64 @@
+"""Test the event types table manager."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.components import recorder
+from homeassistant.components.recorder.db_schema import EventTypes
+from homeassistant.components.recorder.table_managers.event_types import CACHE_SIZE
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+
+from ..common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+async def test_non_existent_event_types_are_bounded(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the non-existent event types start over once they exceed the cache size."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_COMMIT_INTERVAL: 0}
+    )
+    await async_wait_recording_done(hass)
+    event_type_manager = instance.event_type_manager
+    non_existent_event_types = [f"non_existent_{idx}" for idx in range(CACHE_SIZE)]
+
+    with session_scope(session=instance.get_session()) as session:
+        assert event_type_manager.get_many(
+            non_existent_event_types, session, True
+        ) == dict.fromkeys(non_existent_event_types)
+        assert event_type_manager._non_existent_event_types == set(
+            non_existent_event_types
+        )
+
+        # One more does not fit, so the set is cleared before adding it
+        event_type_manager.get_many(("overflow",), session, True)
+        assert event_type_manager._non_existent_event_types == {"overflow"}
+
+        event_type_manager.get_many(("another",), session, True)
+        assert event_type_manager._non_existent_event_types == {
+            "overflow",
+            "another",
+        }
+
+
+async def test_get_many_does_not_query_pending_event_types(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test pending event types are neither queried nor queued for a refresh."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_COMMIT_INTERVAL: 0}
+    )
+    await async_wait_recording_done(hass)
+    event_type_manager = instance.event_type_manager
+    event_type_manager.add_pending(EventTypes(event_type="pending"))
+
+    with session_scope(session=instance.get_session()) as session, patch(
+        "homeassistant.components.recorder.table_managers.event_types.execute_stmt_lambda_element"
+    ) as mock_execute, patch.object(instance, "queue_task") as mock_queue_task:
+        assert event_type_manager.get_many(("pending",), session) == {"pending": None}
+
+    assert not mock_execute.called
+    assert not mock_queue_task.called
@@ -228,7 +228,7 @@ async def test_purge_old_states_encounters_temporary_mysql_error(
         "homeassistant.components.recorder.purge._purge_old_recorder_runs",
         side_effect=[mysql_exception, None],
     ), patch.object(
-        instance.engine.dialect, "name", "mysql"
+        instance, "_dialect_name", SupportedDialect.MYSQL
     ):
         await hass.services.async_call(recorder.DOMAIN, SERVICE_PURGE, {"keep_days": 0})
         await hass.async_block_till_done()
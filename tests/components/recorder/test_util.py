@@ -10,7 +10,6 @@ import pytest
 from sqlalchemy import lambda_stmt, text
 from sqlalchemy.engine.result import ChunkedIteratorResult
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.components import recorder
@@ -71,6 +70,27 @@ def test_recorder_bad_execute(hass_recorder: Callable[..., HomeAssistant]) -> No
     assert e_mock.call_count == 2
 
 
+def test_execute_raw(hass_recorder: Callable[..., HomeAssistant]) -> None:
+    """Test execute can skip the ORM and return the rows of the statement."""
+    hass = hass_recorder()
+
+    with session_scope(hass=hass) as session:
+        qry = session.query(RecorderRuns)
+        runs = util.execute(qry)
+        assert runs
+        assert all(isinstance(run, RecorderRuns) for run in runs)
+
+        rows = util.execute(qry, raw=True)
+        assert len(rows) == len(runs)
+        assert not any(isinstance(row, RecorderRuns) for row in rows)
+        assert [row.run_id for row in rows] == [run.run_id for run in runs]
+        assert [row.start for row in rows] == [run.start for run in runs]
+
+        # A single column is returned as the values themselves
+        run_ids = util.execute(session.query(RecorderRuns.run_id), raw=True)
+        assert run_ids == [run.run_id for run in runs]
+
+
 def test_validate_or_move_away_sqlite_database(
     hass: HomeAssistant, tmp_path: Path, caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -81,7 +101,10 @@ def test_validate_or_move_away_sqlite_database(
     dburl = f"{SQLITE_URL_PREFIX}{test_db_file}"
 
     assert util.validate_sqlite_database(test_db_file) is False
-    assert os.path.exists(test_db_file) is True
+    assert os.path.exists(test_db_file) is False
+
+    Path(test_db_file).touch()
+    assert util.validate_sqlite_database(test_db_file) is False
     assert util.validate_or_move_away_sqlite_database(dburl) is False
 
     corrupt_db_file(test_db_file)
@@ -813,11 +836,10 @@ def test_periodic_db_cleanups(
     with patch.object(util.get_instance(hass).engine, "connect") as connect_mock:
         util.periodic_db_cleanups(util.get_instance(hass))
 
-    text_obj = connect_mock.return_value.__enter__.return_value.execute.mock_calls[0][
-        1
-    ][0]
-    assert isinstance(text_obj, TextClause)
-    assert str(text_obj) == "PRAGMA wal_checkpoint(TRUNCATE);"
+    connection = connect_mock.return_value.__enter__.return_value
+    connection.connection.executescript.assert_called_once_with(
+        "PRAGMA wal_checkpoint(TRUNCATE);PRAGMA OPTIMIZE;"
+    )
 
 
 @patch("homeassistant.components.recorder.pool.check_loop")
@@ -871,7 +893,10 @@ def test_build_mysqldb_conv() -> None:
         "sys.modules",
         **{"MySQLdb.constants": mock_constants, "MySQLdb.converters": mock_converters},
     ):
+        util.build_mysqldb_conv.cache_clear()
         conv = util.build_mysqldb_conv()
+        assert util.build_mysqldb_conv() is conv
+        util.build_mysqldb_conv.cache_clear()
 
     assert conv["original"] == "preserved"
     assert conv["DATETIME"]("INVALID") is None
@@ -921,7 +946,15 @@ def test_execute_stmt_lambda_element(
         assert rows[0].metadata_id == metadata_id
 
         # Time window >= 2 days, we get a ChunkedIteratorResult
-        rows = util.execute_stmt_lambda_element(session, stmt, now, one_week_from_now)
+        # streamed from a server side cursor
+        with patch.object(session, "execute", wraps=session.execute) as mock_execute:
+            rows = util.execute_stmt_lambda_element(
+                session, stmt, now, one_week_from_now, yield_per=50
+            )
+        assert mock_execute.call_args.kwargs["execution_options"] == {
+            "stream_results": True,
+            "yield_per": 50,
+        }
         assert isinstance(rows, ChunkedIteratorResult)
         row = next(rows)
         assert row.state == new_state.state
@@ -929,9 +962,17 @@ def test_execute_stmt_lambda_element(
 
         # Time window >= 2 days, we should not get a ChunkedIteratorResult
         # because orm_rows=False
-        rows = util.execute_stmt_lambda_element(
-            session, stmt, now, one_week_from_now, orm_rows=False
-        )
+        connection = session.connection()
+        with patch.object(session, "connection", return_value=connection), patch.object(
+            connection, "execute", wraps=connection.execute
+        ) as mock_connection_execute:
+            rows = util.execute_stmt_lambda_element(
+                session, stmt, now, one_week_from_now, yield_per=50, orm_rows=False
+            )
+        assert mock_connection_execute.call_args.kwargs["execution_options"] == {
+            "stream_results": True,
+            "yield_per": 50,
+        }
         assert not isinstance(rows, ChunkedIteratorResult)
         row = next(rows)
         assert row.state == new_state.state
@@ -1023,3 +1064,63 @@ async def test_resolve_period(hass: HomeAssistant) -> None:
             }
         }
     ) == (now - timedelta(hours=1, minutes=25), now - timedelta(minutes=25))
+
+
+def test_get_index_by_name_sqlite(hass_recorder: Callable[..., HomeAssistant]) -> None:
+    """Test finding an index by exact and prefixed name on SQLite."""
+    hass = hass_recorder()
+
+    with session_scope(hass=hass) as session:
+        assert (
+            util.get_index_by_name(
+                session, "recorder_runs", "ix_recorder_runs_start_end"
+            )
+            == "ix_recorder_runs_start_end"
+        )
+        assert (
+            util.get_index_by_name(session, "recorder_runs", "recorder_runs_start_end")
+            == "ix_recorder_runs_start_end"
+        )
+        assert util.get_index_by_name(session, "recorder_runs", "missing") is None
+
+        # The indexes SQLite creates for UNIQUE constraints cannot be dropped
+        session.execute(text("CREATE TABLE test_unique (value INTEGER UNIQUE)"))
+        assert util.get_index_by_name(session, "test_unique", "1") is None
+        assert (
+            util.get_index_by_name(
+                session, "test_unique", "sqlite_autoindex_test_unique_1"
+            )
+            is None
+        )
+
+
+@pytest.mark.parametrize(
+    ("dialect_name", "index_table"),
+    [("mysql", "information_schema.STATISTICS"), ("postgresql", "pg_indexes")],
+)
+def test_get_index_by_name_mysql_postgresql(
+    dialect_name: str, index_table: str
+) -> None:
+    """Test finding an index by name queries the index names on MySQL and PostgreSQL."""
+    session = MagicMock()
+    connection = session.connection.return_value
+    connection.dialect.name = dialect_name
+    connection.execute.return_value.scalars.return_value.all.return_value = [
+        None,
+        "PRIMARY",
+        "ix_states_last_updated_ts",
+    ]
+
+    assert (
+        util.get_index_by_name(session, "states", "ix_states_last_updated_ts")
+        == "ix_states_last_updated_ts"
+    )
+    assert (
+        util.get_index_by_name(session, "states", "last_updated_ts")
+        == "ix_states_last_updated_ts"
+    )
+    assert util.get_index_by_name(session, "states", "missing") is None
+
+    statement, params = connection.execute.call_args[0]
+    assert index_table in str(statement)
+    assert params == {"table_name": "states"}